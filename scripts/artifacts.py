@@ -4,78 +4,243 @@
 # Local test:
 #
 #   READTHEDOCS_GIT_COMMIT_HASH=$(git rev-parse HEAD) READTHEDOCS=True \
-#     GH_API_TOKEN=<TOKEN> python artifacts.py
+#     GH_API_TOKEN=<TOKEN> python scripts/artifacts.py
 
+import json
 import os
 import pathlib
+import shutil
 import sys
-
-import requests
+import tempfile
+import time
+import zipfile
 
 docs_source = pathlib.Path(__file__).parent.parent.joinpath("docs/source").resolve()
 target = docs_source.joinpath("artifact/gurobipy-pandas-examples.zip")
-
-
-def download_executed_notebooks(runs_url, gh_token, head_sha):
-    headers = {
-        "X-GitHub-Api-Version": "2022-11-28",
-        "Authorization": f"Bearer {gh_token}",
-    }
-
-    params = {"head_sha": head_sha}
-    response = requests.get(runs_url, headers=headers, params=params)
+etag_cache_file = pathlib.Path(__file__).parent.parent.joinpath(".artifacts_etag.json")
+cache_dir = pathlib.Path(__file__).parent.parent.joinpath(".cache")
+
+
+def _require_env():
+    # Validate configuration up front, before any third-party modules are
+    # imported or network requests are made
+    if not os.environ.get("GH_API_TOKEN"):
+        # Pull requests run in this configuration
+        print("No API token, can't fetch artifacts. Continuing build with dummy file.")
+        os.makedirs(target.parent, exist_ok=True)
+        with target.open("wb") as outfile:
+            outfile.write(b"")
+        sys.exit(0)
+
+    if not os.environ.get("READTHEDOCS_GIT_COMMIT_HASH"):
+        print("READTHEDOCS_GIT_COMMIT_HASH is not set, can't identify the commit.")
+        sys.exit(1)
+
+    return os.environ["GH_API_TOKEN"], os.environ["READTHEDOCS_GIT_COMMIT_HASH"]
+
+
+def make_session(gh_token):
+    # Shared session: reuses pooled keep-alive connections to api.github.com
+    # across requests, and retries transient server errors
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # Only retry transient server errors here. Retry-After is ignored
+            # so that 403/429 rate limits are left to gh_get, which retries
+            # them within its max_wait budget.
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                respect_retry_after_header=False,
+            ),
+        ),
+    )
+    session.headers.update(
+        {
+            "X-GitHub-Api-Version": "2022-11-28",
+            "Authorization": f"Bearer {gh_token}",
+        }
+    )
+    return session
+
+
+def load_etag_cache(head_sha):
+    # Cached responses are only valid for the commit they were fetched for
+    try:
+        with etag_cache_file.open() as infile:
+            return json.load(infile).get(head_sha, {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_etag_cache(head_sha, cache):
+    with etag_cache_file.open("w") as outfile:
+        json.dump({head_sha: cache}, outfile)
+
+
+def rate_limit_delay(response, attempt):
+    # Returns the number of seconds to wait before retrying a rate-limited
+    # request, or None if the response is not a rate limit error.
+    if response.status_code not in (403, 429):
+        return None
+    if "Retry-After" in response.headers:
+        return int(response.headers["Retry-After"])
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return max(0, int(response.headers["X-RateLimit-Reset"]) - time.time())
+    if response.status_code == 429:
+        # Secondary rate limit without guidance: back off exponentially
+        return 60 * 2**attempt
+    return None
+
+
+def gh_get(
+    session, url, headers=None, params=None, stream=False, max_retries=3, max_wait=600
+):
+    # Makes at most max_retries + 1 requests for rate limited (403/429)
+    # responses. max_wait caps the total time spent sleeping on rate limits,
+    # so that the build fails quickly instead of running into the RTD build
+    # timeout. This relies on the session adapter not retrying rate limits
+    # itself (see make_session).
+    waited = 0
+    for attempt in range(max_retries + 1):
+        response = session.get(url, headers=headers, params=params, stream=stream)
+        delay = rate_limit_delay(response, attempt)
+        if delay is None or attempt == max_retries or waited + delay > max_wait:
+            break
+        print(f"Rate limited, retrying in {delay:.0f}s: {url}")
+        # Release the pooled connection (left open for streamed responses)
+        response.close()
+        time.sleep(delay)
+        waited += delay
+
+    # Stay inside the quota: if it is nearly used up, wait for the reset
+    # rather than failing a later request. Error responses are returned
+    # immediately, since the caller raises on them anyway.
+    remaining = int(response.headers.get("X-RateLimit-Remaining", 5000))
+    if response.ok and remaining < 10 and "X-RateLimit-Reset" in response.headers:
+        delay = max(0, int(response.headers["X-RateLimit-Reset"]) - time.time())
+        if waited + delay <= max_wait:
+            print(f"Rate limit nearly exhausted, waiting {delay:.0f}s for reset")
+            time.sleep(delay)
+
+    return response
+
+
+def get_json(session, url, cache, params=None):
+    import orjson
+
+    # Conditional GET: if the resource is unchanged, GitHub replies with 304
+    # (which does not count against the rate limit) and the cached body is
+    # reused.
+    cached = cache.get(url)
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+
+    response = gh_get(session, url, headers, params=params)
+    if cached and response.status_code == 304:
+        print(f"Not modified: {url}")
+        return cached["data"]
     response.raise_for_status()
-    runs_data = response.json()
-
-    for run in runs_data["workflow_runs"]:
-        print("Run id={id} event={event} status={status} path={path}".format(**run))
-
-        if run["path"] != ".github/workflows/main.yml":
-            continue
-        if run["status"] != "completed":
-            continue
-        if run["conclusion"] != "success":
-            continue
-
-        artifacts_url = run["artifacts_url"]
-        response = requests.get(artifacts_url, headers=headers)
-        response.raise_for_status()
-        artifacts_data = response.json()
 
-        for artifact in artifacts_data["artifacts"]:
-            print("Artifact id={id} name={name}".format(**artifact))
+    data = orjson.loads(response.content)
+    if "ETag" in response.headers:
+        cache[url] = {"etag": response.headers["ETag"], "data": data}
+    return data
 
-            if artifact["name"] != "notebook-examples":
-                continue
-
-            download_url = artifact["archive_download_url"]
-            response = requests.get(download_url, headers=headers)
-            response.raise_for_status()
-
-            os.makedirs(target.parent, exist_ok=True)
-            if target.exists():
-                target.unlink()
-            with target.open("wb") as outfile:
-                outfile.write(response.content)
-
-            print(f"Downloaded {target}")
-            return True
-
-    return False
 
+def download_executed_notebooks(runs_url, gh_token, head_sha):
+    # The archive for a given commit never changes, so skip the API entirely
+    # if it was already downloaded for this commit by a previous build
+    cached_archive = cache_dir.joinpath(f"notebooks-{head_sha}.zip")
+    if zipfile.is_zipfile(cached_archive):
+        os.makedirs(target.parent, exist_ok=True)
+        shutil.copyfile(cached_archive, target)
+        print(f"Using cached {cached_archive}")
+        return True
+
+    session = make_session(gh_token)
+    etag_cache = load_etag_cache(head_sha)
+
+    # Filter server-side: runs_url is the runs endpoint of a single workflow,
+    # and only successfully completed runs are returned. The latest such run
+    # is all we need.
+    params = {"head_sha": head_sha, "status": "success", "per_page": 1}
+    runs_data = get_json(session, runs_url, etag_cache, params=params)
+
+    # Save now, so a retry after an unfinished workflow run can still use
+    # a conditional request
+    save_etag_cache(head_sha, etag_cache)
+
+    if not runs_data["workflow_runs"]:
+        return False
+    run = runs_data["workflow_runs"][0]
+    print("Run id={id} event={event} status={status} path={path}".format(**run))
+
+    assert run["status"] == "completed"
+    assert run["conclusion"] == "success"
+
+    # List only the notebook-examples artifact of this run (filtered
+    # server-side by name)
+    params = {"name": "notebook-examples"}
+    artifacts_data = get_json(session, run["artifacts_url"], etag_cache, params=params)
+
+    save_etag_cache(head_sha, etag_cache)
+
+    artifacts = [a for a in artifacts_data["artifacts"] if not a["expired"]]
+    if not artifacts:
+        return False
+    artifact = artifacts[0]
+    print("Artifact id={id} name={name}".format(**artifact))
+
+    download_url = artifact["archive_download_url"]
+    response = gh_get(session, download_url, stream=True)
+    response.raise_for_status()
 
-if not os.environ.get("GH_API_TOKEN"):
-    # Pull requests run in this configuration
-    print("No API token, can't fetch artifacts. Continuing build with dummy file.")
+    # Stream the archive to disk in chunks rather than holding the
+    # whole zip in memory. Write to a temporary file and move it into place
+    # once complete, so an interrupted download never leaves a truncated
+    # archive at the target path.
     os.makedirs(target.parent, exist_ok=True)
-    with target.open("wb") as outfile:
-        outfile.write(b"")
-    sys.exit(0)
+    response.raw.decode_content = True
+    outfile = tempfile.NamedTemporaryFile(dir=target.parent, delete=False)
+    try:
+        with outfile:
+            shutil.copyfileobj(response.raw, outfile, length=1 << 20)
+        if not zipfile.is_zipfile(outfile.name):
+            raise RuntimeError(
+                f"Downloaded artifact is not a zip archive: {download_url}"
+            )
+        # NamedTemporaryFile creates the file as 0600; publish it readable
+        os.chmod(outfile.name, 0o644)
+        os.replace(outfile.name, target)
+    except BaseException:
+        os.unlink(outfile.name)
+        raise
+
+    print(f"Downloaded {target}")
+
+    # Keep a copy keyed by commit, replacing archives cached for other commits
+    cache_dir.mkdir(exist_ok=True)
+    for path in cache_dir.glob("notebooks-*"):
+        path.unlink()
+    shutil.copyfile(target, cached_archive.with_suffix(".tmp"))
+    os.replace(cached_archive.with_suffix(".tmp"), cached_archive)
+    return True
+
+
+gh_token, head_sha = _require_env()
 
 success = download_executed_notebooks(
-    runs_url="https://api.github.com/repos/Gurobi/gurobipy-pandas/actions/runs",
-    gh_token=os.environ["GH_API_TOKEN"],
-    head_sha=os.environ["READTHEDOCS_GIT_COMMIT_HASH"],
+    runs_url="https://api.github.com/repos/Gurobi/gurobipy-pandas/actions/workflows/main.yml/runs",
+    gh_token=gh_token,
+    head_sha=head_sha,
 )
 
 if success:
@@ -149,48 +149,47 @@ def add_vars(
     Series
         A Series of vars with the the index of `pandas_obj`
     """
-    if isinstance(pandas_obj, pd.Index):
-        # Use the given index as the base object. All attribute arguments must
-        # be single values, or series aligned with the index.
-        return add_vars_from_index(
-            model,
-            pandas_obj,
-            name=name,
-            lb=lb,
-            ub=ub,
-            obj=obj,
-            vtype=vtype,
-            index_formatter=index_formatter,
-        )
-    elif isinstance(pandas_obj, pd.Series):
-        # Use the index of the given series as the base object. All attribute
-        # arguments must be single values, or series on the same index as the
-        # given series.
-        return add_vars_from_index(
-            model,
-            pandas_obj.index,
-            name=name,
-            lb=lb,
-            ub=ub,
-            obj=obj,
-            vtype=vtype,
-            index_formatter=index_formatter,
-        )
-    elif isinstance(pandas_obj, pd.DataFrame):
-        # Use the given dataframe as the base object. All attribute arguments
-        # must be single values, or names of columns in the given dataframe.
-        return add_vars_from_dataframe(
-            model,
-            pandas_obj,
-            name=name,
-            lb=lb,
-            ub=ub,
-            obj=obj,
-            vtype=vtype,
-            index_formatter=index_formatter,
-        )
-    else:
-        raise ValueError("`pandas_obj` must be an index, series, or dataframe")
+    handler = _ADD_VARS_DISPATCH.get(type(pandas_obj))
+    if handler is None:
+        handler = _add_vars_handler(pandas_obj)
+    return handler(
+        model,
+        pandas_obj,
+        name=name,
+        lb=lb,
+        ub=ub,
+        obj=obj,
+        vtype=vtype,
+        index_formatter=index_formatter,
+    )
+
+
+def _add_vars_from_series(model, series, **kwargs):
+    # Use the index of the given series as the base object. All attribute
+    # arguments must be single values, or series on the same index as the
+    # given series.
+    return add_vars_from_index(model, series.index, **kwargs)
+
+
+# add_vars handlers keyed by exact type, so that dispatch is a single dict
+# lookup. When given an index, all attribute arguments must be single values
+# or series aligned with the index. When given a dataframe, all attribute
+# arguments must be single values or names of columns in the dataframe.
+_ADD_VARS_DISPATCH = {
+    pd.Index: add_vars_from_index,
+    pd.Series: _add_vars_from_series,
+    pd.DataFrame: add_vars_from_dataframe,
+}
+
+
+def _add_vars_handler(pandas_obj):
+    # Slow path for subclasses (e.g. MultiIndex, RangeIndex). The handler
+    # found is cached against the subclass for subsequent calls.
+    for base_type, handler in list(_ADD_VARS_DISPATCH.items()):
+        if isinstance(pandas_obj, base_type):
+            _ADD_VARS_DISPATCH[type(pandas_obj)] = handler
+            return handler
+    raise ValueError("`pandas_obj` must be an index, series, or dataframe")
 
 
 # Two overloads are used here to specify that at least one of the left- and
@@ -10,8 +10,24 @@ from .utils import GurobiModelTestCase
 
 
 class TestDataFrameAddVars(GurobiModelTestCase):
+    # Share one env and model across tests to avoid repeated environment
+    # startup; the model is emptied before each test instead.
+
+    @classmethod
+    def setUpClass(cls):
+        cls.env = gp.Env()
+        cls.model = gp.Model(env=cls.env)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.model.close()
+        cls.env.close()
+
     def setUp(self):
-        super().setUp()
+        self.model.update()
+        self.model.remove(self.model.getVars())
+        self.model.remove(self.model.getConstrs())
+        self.model.update()
         self.df = pd.DataFrame(
             index=[0, 2, 3],
             data=[
@@ -21,6 +37,10 @@ class TestDataFrameAddVars(GurobiModelTestCase):
             ],
         )
 
+    def tearDown(self):
+        # Env and model are closed in tearDownClass
+        pass
+
     def test_no_args(self):
         # Adds a series of gp.Var as named column. This should be the
         # simplest test we can have; the new column must have a name so
@@ -59,24 +79,32 @@ class TestDataFrameAddVars(GurobiModelTestCase):
     def test_set_bounds_by_column(self):
         result = self.df.gppd.add_vars(self.model, name="x", lb="a", ub="b")
         self.model.update()
-        for row in result.itertuples():
-            self.assertEqual(row.x.lb, row.a)
-            self.assertEqual(row.x.ub, row.b)
+        x = result["x"].tolist()
+        lb = pd.Series(self.model.getAttr("LB", x), index=result.index)
+        ub = pd.Series(self.model.getAttr("UB", x), index=result.index)
+        assert_series_equal(lb, result["a"].astype(float), check_names=False)
+        assert_series_equal(ub, result["b"].astype(float), check_names=False)
 
     def test_set_objective_by_column(self):
         result = self.df.gppd.add_vars(self.model, name="x", obj="a")
         self.model.update()
-        for row in result.itertuples():
-            self.assertEqual(row.x.obj, row.a)
+        obj = pd.Series(
+            self.model.getAttr("Obj", result["x"].tolist()), index=result.index
+        )
+        assert_series_equal(obj, result["a"].astype(float), check_names=False)
 
     def test_multiindex(self):
         df = self.df.assign(c=1).set_index(["b", "a"])
         result = df.gppd.add_vars(self.model, name="z")
         self.model.update()
         self.assertEqual(list(result.columns), ["c", "z"])
-        for row in result.itertuples():
-            ind = ",".join(map(str, row.Index))
-            self.assertEqual(row.z.VarName, f"z[{ind}]")
+        b = result.index.get_level_values("b").astype(str)
+        a = result.index.get_level_values("a").astype(str)
+        expected = pd.Series("z[" + b + "," + a + "]", index=result.index)
+        names = pd.Series(
+            self.model.getAttr("VarName", result["z"].tolist()), index=result.index
+        )
+        assert_series_equal(names, expected)
 
     def test_index_formatter(self):
         # Test that the index_formatter argument is passed through and applied.
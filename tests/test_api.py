@@ -92,6 +92,17 @@ class TestAddVars(GurobiModelTestCase):
         self.assertTrue((x.gppd.UB >= 1e100).all())
         assert_series_equal(x.gppd.Obj, objseries, check_names=False)
 
+    def test_from_multiindex(self):
+        index = pd.MultiIndex.from_tuples([(1, "a"), (2, "b"), (3, "c")])
+
+        x = gppd.add_vars(self.model, index, name="x")
+
+        self.model.update()
+        self.assertEqual(self.model.NumVars, 3)
+        assert_index_equal(x.index, index)
+        for (i, j), variable in x.items():
+            self.assertEqual(variable.VarName, f"x[{i},{j}]")
+
     def test_names_1(self):
         # Default name sanitization
         index = pd.Index(["a  b", "c^d", "e+f"])
@@ -305,6 +316,12 @@ class TestDataValidation(GurobiModelTestCase):
         ):
             gppd.add_constrs(self.model, x, 3.5, y)
 
+    def test_add_vars_bad_type(self):
+        with self.assertRaisesRegex(
+            ValueError, "`pandas_obj` must be an index, series, or dataframe"
+        ):
+            gppd.add_vars(self.model, ["a", "e", "g"], name="x")
+
 
 class TestNonInteractiveMode(GurobiModelTestCase):
     # Check that no updates are run by default.